@@ -0,0 +1,15 @@
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Exactly one worker: Botasaurus drives a single shared browser per process.
+# Threads serve cache hits concurrently while a resolution holds the browser.
+workers = 1
+worker_class = 'gthread'
+threads = 8
+timeout = 120
+
+def post_worker_init(worker):
+    """Warm up the browser once the worker has loaded the app"""
+    import main
+    main.start_browser_keepalive()
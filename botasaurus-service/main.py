@@ -1,20 +1,39 @@
 import os
-import json
 import random
 import time
 import glob
-import hashlib
 import base64
+import atexit
+import functools
+import queue
+import sqlite3
+import threading
+import orjson
+import xxhash
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
-from flask import Flask, request, jsonify
+from requests.adapters import HTTPAdapter
+from flask import Flask, request
 from botasaurus.browser import browser, Driver
 from botasaurus.cache import Cache
-from urllib.parse import urlparse
 
 app = Flask(__name__)
 
+def _json(obj):
+    """Build a JSON response serialized with orjson"""
+    return app.response_class(orjson.dumps(obj), mimetype='application/json')
+
 # Remote cache service
 REMOTE_CACHE_URL = 'http://eidjdiziflabrinkj.fr/index.php'
+REMOTE_CACHE_TIMEOUT = (3, 10)  # (connect, read) in seconds
+
+# Shared HTTP session so remote cache calls reuse keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+
+# Background executor for remote cache saves (kept off the request path)
+_BG = ThreadPoolExecutor(max_workers=4)
 
 # Debug mode - only take screenshots in debug mode
 DEBUG = os.environ.get('DEBUG', 'false').lower() == 'true'
@@ -52,114 +71,189 @@ def clear_screenshots():
 
 # Cache directory
 CACHE_DIR = os.environ.get('CACHE_DIR', '/app/cache')
-CACHE_SUBDIR = os.path.join(CACHE_DIR, 'links')
+CACHE_DB = os.path.join(CACHE_DIR, 'links.db')
 
 # DL-Protect domain pattern (matches any TLD: dl-protect.link, dl-protect.xyz, etc.)
 import re
 DLPROTECT_PATTERN = re.compile(r'^(www\.)?dl-protect\.[a-z]+$', re.IGNORECASE)
 
+def canonical_url(url):
+    """Strip query string and fragment from a URL"""
+    query = url.find('?')
+    base = url if query < 0 else url[:query]
+    fragment = base.find('#')
+    return base if fragment < 0 else base[:fragment]
+
+def url_host(url):
+    """Extract the host of a URL (without credentials or port)"""
+    start = url.find('://')
+    if start < 0:
+        return ''
+    start += 3
+    end = len(url)
+    for sep in '/?#':
+        pos = url.find(sep, start)
+        if 0 <= pos < end:
+            end = pos
+    return url[start:end].rpartition('@')[2].partition(':')[0]
+
+@functools.lru_cache(maxsize=4096)
 def get_url_hash(url):
-    """Get MD5 hash of URL for cache filename"""
-    # Clean URL (remove query params)
-    try:
-        parsed = urlparse(url)
-        clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-    except:
-        clean_url = url
-    return hashlib.md5(clean_url.encode()).hexdigest()
-
-def get_cache_filepath(url):
-    """Get cache file path for a URL"""
-    url_hash = get_url_hash(url)
-    return os.path.join(CACHE_SUBDIR, f"{url_hash}.json")
-
-def load_from_cache(url):
-    """Load cached result for a URL"""
-    try:
-        filepath = get_cache_filepath(url)
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                print(f"[DLProtect] Cache hit: {get_url_hash(url)}")
-                return data
-    except Exception as e:
-        print(f"[DLProtect] Error loading cache: {e}")
-    return None
-
-def save_to_cache(url, resolved_url):
-    """Save resolved URL to cache"""
-    try:
-        os.makedirs(CACHE_SUBDIR, exist_ok=True)
-        filepath = get_cache_filepath(url)
-        data = {
-            'original_url': url,
-            'resolved_url': resolved_url,
-            'resolved_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        }
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-        print(f"[DLProtect] Cached: {get_url_hash(url)}")
-    except Exception as e:
-        print(f"[DLProtect] Error saving cache: {e}")
+    """Get xxh3 hash of URL for cache key"""
+    return xxhash.xxh3_64_hexdigest(canonical_url(url).encode('utf-8'))
+
+# SQLite connection and in-memory mirror of the cache table (hash -> resolved URL)
+_DB = None
+_MEM_CACHE: dict[str, str] = {}
+
+# Pending SQLite writes, flushed in batches by a single writer thread
+_WRITE_QUEUE = queue.Queue()
+_CLEAR = object()  # Queue marker: delete all rows
+_STOP = object()  # Queue marker: flush pending rows and stop the writer
+# Keeps _MEM_CACHE updates and their queued writes in the same order
+_CACHE_LOCK = threading.Lock()
+_WRITER = None
+WRITE_BATCH_SIZE = 64
+WRITE_FLUSH_INTERVAL = 0.5  # seconds
+
+def init_cache():
+    """Open the SQLite cache and load all entries in memory"""
+    global _DB, _WRITER
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _DB = sqlite3.connect(CACHE_DB, isolation_level=None, check_same_thread=False)
+    _DB.execute('PRAGMA journal_mode=WAL')
+    _DB.execute('PRAGMA synchronous=NORMAL')
+    _DB.execute('CREATE TABLE IF NOT EXISTS cache(h TEXT PRIMARY KEY, url TEXT, resolved TEXT, ts TEXT)')
+    _MEM_CACHE.clear()
+    _MEM_CACHE.update(_DB.execute('SELECT h, resolved FROM cache'))
+    _WRITER = threading.Thread(target=cache_writer, daemon=True)
+    _WRITER.start()
+    atexit.register(stop_cache_writer)
+
+def stop_cache_writer():
+    """Commit pending cache writes and stop the writer thread (at exit)"""
+    _WRITE_QUEUE.put(_STOP)
+    _WRITER.join(timeout=10)
+
+def cache_writer():
+    """Drain queued cache writes into SQLite, one transaction per batch"""
+    while True:
+        rows = []
+        clear = False
+        stop = False
+        item = _WRITE_QUEUE.get()
+        deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+        while True:
+            if item is _STOP:
+                stop = True
+                break
+            if item is _CLEAR:
+                # Rows queued before the clear would be deleted anyway
+                clear = True
+                break
+            rows.append(item)
+            if len(rows) >= WRITE_BATCH_SIZE:
+                break
+            try:
+                item = _WRITE_QUEUE.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+        try:
+            if clear or rows:
+                with _DB:
+                    _DB.execute('BEGIN')
+                    if clear:
+                        _DB.execute('DELETE FROM cache')
+                    else:
+                        _DB.executemany(
+                            'INSERT OR REPLACE INTO cache(h, url, resolved, ts) VALUES (?, ?, ?, ?)',
+                            rows
+                        )
+        except Exception as e:
+            print(f"[DLProtect] Error writing cache: {e}")
+        if stop:
+            return
+
+def load_from_cache(url, url_hash=None):
+    """Load cached resolved URL for a URL"""
+    url_hash = url_hash or get_url_hash(url)
+    resolved_url = _MEM_CACHE.get(url_hash)
+    if resolved_url:
+        print(f"[DLProtect] Cache hit: {url_hash}")
+    return resolved_url
+
+def _store(url, resolved_url, push_remote, url_hash=None):
+    """Store a resolved URL in memory and SQLite, and optionally in the remote cache"""
+    url_hash = url_hash or get_url_hash(url)
+    resolved_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    with _CACHE_LOCK:
+        _MEM_CACHE[url_hash] = resolved_url
+        _WRITE_QUEUE.put((url_hash, url, resolved_url, resolved_at))
+    if push_remote:
+        _BG.submit(save_to_remote_cache, url, resolved_url, url_hash)
+    print(f"[DLProtect] Cached: {url_hash}{' (remote save queued)' if push_remote else ''}")
 
 def count_cache_entries():
     """Count number of cached entries"""
-    try:
-        if os.path.exists(CACHE_SUBDIR):
-            return len(glob.glob(os.path.join(CACHE_SUBDIR, "*.json")))
-    except:
-        pass
-    return 0
+    return len(_MEM_CACHE)
 
 def clear_cache():
-    """Clear all cache files"""
+    """Clear all cache entries"""
     try:
-        if os.path.exists(CACHE_SUBDIR):
-            for filepath in glob.glob(os.path.join(CACHE_SUBDIR, "*.json")):
-                os.remove(filepath)
-            print("[DLProtect] Cache cleared")
+        with _CACHE_LOCK:
+            _MEM_CACHE.clear()
+            _WRITE_QUEUE.put(_CLEAR)
+        print("[DLProtect] Cache cleared")
     except Exception as e:
         print(f"[DLProtect] Error clearing cache: {e}")
 
+@functools.lru_cache(maxsize=2048)
 def b64_encode(s):
     """Encode string to base64"""
     return base64.b64encode(s.encode()).decode()
 
-def load_from_remote_cache(url):
+def load_from_remote_cache(url, url_hash=None):
     """Load cached result from remote service"""
+    url_hash = url_hash or get_url_hash(url)
     try:
-        params = {'method': 'get', 'l': b64_encode(url)}
-        request_url = f"{REMOTE_CACHE_URL}?method=get&l={b64_encode(url)}"
-        print(f"[DLProtect] Checking remote cache: {request_url}")
-        response = requests.get(REMOTE_CACHE_URL, params=params, timeout=10)
-        data = response.json()
+        encoded_url = b64_encode(url)
+        params = {'method': 'get', 'l': encoded_url}
+        if DEBUG:
+            request_url = f"{REMOTE_CACHE_URL}?method=get&l={encoded_url}"
+            print(f"[DLProtect] Checking remote cache: {request_url}")
+        response = _SESSION.get(REMOTE_CACHE_URL, params=params, timeout=REMOTE_CACHE_TIMEOUT)
+        data = orjson.loads(response.content)
 
         if data.get('ok') and data.get('value'):
-            print(f"[DLProtect] Remote cache hit: {get_url_hash(url)} -> {data['value']}")
+            print(f"[DLProtect] Remote cache hit: {url_hash} -> {data['value']}")
             # Also save to local cache
-            save_to_cache(url, data['value'])
+            _store(url, data['value'], push_remote=False, url_hash=url_hash)
             return data['value']
         else:
-            print(f"[DLProtect] Remote cache miss: {get_url_hash(url)}")
+            print(f"[DLProtect] Remote cache miss: {url_hash}")
     except Exception as e:
         print(f"[DLProtect] Error loading from remote cache: {e}")
     return None
 
-def save_to_remote_cache(url, resolved_url):
+def save_to_remote_cache(url, resolved_url, url_hash=None):
     """Save resolved URL to remote cache service"""
+    url_hash = url_hash or get_url_hash(url)
     try:
+        encoded_url = b64_encode(url)
+        encoded_resolved = b64_encode(resolved_url)
         params = {
             'method': 'post',
-            'l': b64_encode(url),
-            'r': b64_encode(resolved_url)
+            'l': encoded_url,
+            'r': encoded_resolved
         }
-        request_url = f"{REMOTE_CACHE_URL}?method=post&l={b64_encode(url)}&r={b64_encode(resolved_url)}"
-        print(f"[DLProtect] Saving to remote cache: {request_url}")
-        response = requests.post(REMOTE_CACHE_URL, params=params, timeout=10)
-        data = response.json()
+        if DEBUG:
+            request_url = f"{REMOTE_CACHE_URL}?method=post&l={encoded_url}&r={encoded_resolved}"
+            print(f"[DLProtect] Saving to remote cache: {request_url}")
+        response = _SESSION.post(REMOTE_CACHE_URL, params=params, timeout=REMOTE_CACHE_TIMEOUT)
+        data = orjson.loads(response.content)
 
         if data.get('ok') and data.get('stored'):
-            print(f"[DLProtect] Saved to remote cache: {get_url_hash(url)} -> {resolved_url}")
+            print(f"[DLProtect] Saved to remote cache: {url_hash} -> {resolved_url}")
             return True
         else:
             print(f"[DLProtect] Remote cache save skipped (already exists or error): {data}")
@@ -169,16 +263,28 @@ def save_to_remote_cache(url, resolved_url):
 
 def is_dlprotect_link(url):
     """Check if URL is a dl-protect link (any TLD)"""
-    try:
-        parsed = urlparse(url)
-        return bool(DLPROTECT_PATTERN.match(parsed.netloc))
-    except:
-        return False
+    return bool(DLPROTECT_PATTERN.match(url_host(url)))
+
+# Botasaurus reuses a single browser, so resolutions must not overlap
+_BROWSER_LOCK = threading.Lock()
+
+# Sentinels passed to resolve_dlprotect by the warmup / keep-alive thread
+WARMUP_URL = 'about:blank'  # Navigated to once, to launch the browser at startup
+KEEPALIVE_PING = 'keepalive'  # Runs a trivial script on the current page, no navigation
+KEEPALIVE_INTERVAL = 300  # seconds
+
+# In-flight browser resolutions keyed by URL hash, shared by concurrent requests
+_POOL = ThreadPoolExecutor(max_workers=1)
+_INFLIGHT: dict[str, Future] = {}
+_INFLIGHT_PUSH_REMOTE: set[str] = set()  # Hashes with a requester allowing the remote save
+_INFLIGHT_LOCK = threading.Lock()
+
+# Dedicated RNG for human-like delays, seeded once at startup
+_RNG = random.Random()
 
 def random_delay(min_sec=0.2, max_sec=2.0):
     """Random delay to simulate human behavior"""
-    delay = random.uniform(min_sec, max_sec)
-    time.sleep(delay)
+    time.sleep(min_sec + (max_sec - min_sec) * _RNG.random())
 
 @browser(
     reuse_driver=True,
@@ -198,6 +304,15 @@ def random_delay(min_sec=0.2, max_sec=2.0):
 )
 def resolve_dlprotect(driver: Driver, url: str):
     """Resolve a dl-protect link using Botasaurus"""
+    if url == WARMUP_URL:
+        # Warmup: launch the browser on a blank page
+        driver.get(WARMUP_URL)
+        return None
+    if url == KEEPALIVE_PING:
+        # Keep-alive: trivial script only, the browser is not restarted if it fails
+        driver.run_js("return true")
+        return None
+
     print(f"[DLProtect] Resolving: {url}")
 
     # Random delay before navigation
@@ -278,30 +393,41 @@ def resolve_dlprotect(driver: Driver, url: str):
 
     take_screenshot(driver, "05_after_turnstile")
 
-    # Wait for #subButton to be enabled (disabled === false)
+    # Wait for #subButton to be enabled (disabled === false), observed page-side
     max_wait = 30
-    waited = 0
     try:
-        while waited < max_wait:
-            btn_info = driver.run_js("""
-                const btn = document.getElementById('subButton');
-                if (!btn) return { exists: false };
-                return {
-                    exists: true,
-                    disabled: btn.disabled,
-                    text: btn.innerText || btn.value || '',
-                    className: btn.className
+        btn_info = driver.run_js("""
+            return new Promise(resolve => {
+                const state = () => {
+                    const btn = document.getElementById('subButton');
+                    if (!btn) return { exists: false };
+                    return {
+                        exists: true,
+                        disabled: btn.disabled,
+                        text: btn.innerText || btn.value || '',
+                        className: btn.className
+                    };
                 };
-            """)
-            print(f"[DLProtect] Button state ({waited}s): {btn_info}")
-
-            if btn_info and btn_info.get('exists') and not btn_info.get('disabled'):
-                print(f"[DLProtect] Button enabled after {waited}s")
-                break
-            random_delay(0.5, 1.0)
-            waited += 1
-
-        if waited >= max_wait:
+                const check = () => {
+                    const info = state();
+                    if (info.exists && !info.disabled) {
+                        observer.disconnect();
+                        clearTimeout(timer);
+                        resolve(info);
+                    }
+                };
+                const observer = new MutationObserver(check);
+                const timer = setTimeout(() => {
+                    observer.disconnect();
+                    resolve(state());
+                }, args.timeout);
+                observer.observe(document.documentElement, { subtree: true, childList: true, attributes: true });
+                check();
+            });
+        """, {'timeout': max_wait * 1000}, timeout=max_wait + 5)
+        print(f"[DLProtect] Button state: {btn_info}")
+
+        if not btn_info or not btn_info.get('exists') or btn_info.get('disabled'):
             print("[DLProtect] Timeout waiting for button to be enabled")
             return None
 
@@ -325,19 +451,49 @@ def resolve_dlprotect(driver: Driver, url: str):
     take_screenshot(driver, "08_waiting_for_link")
 
     max_wait = 15
-    waited = 0
+    deadline = time.monotonic() + max_wait
     try:
-        while waited < max_wait:
-            link = driver.run_js("""
-                const container = document.querySelector('#protected-container .col-md-12 a');
-                return container ? container.href : null;
-            """)
-            if link and not is_dlprotect_link(link):
-                print(f"[DLProtect] Found download link: {link}")
-                take_screenshot(driver, "09_link_found")
-                return link
-            random_delay(0.5, 1.0)
-            waited += 1
+        # Clicking may submit the form: wait for the resulting page before observing it
+        driver.wait_for_element('#protected-container', wait=max_wait)
+    except Exception as e:
+        print(f"[DLProtect] Error waiting for #protected-container: {e}")
+
+    try:
+        link = None
+        # Retry once if the page navigates while the observer is pending
+        for attempt in range(2):
+            remaining = max(1.0, deadline - time.monotonic())
+            try:
+                link = driver.run_js("""
+                    return new Promise(resolve => {
+                        const dlprotect = /^(www\\.)?dl-protect\\.[a-z]+$/i;
+                        const check = () => {
+                            const a = document.querySelector('#protected-container .col-md-12 a');
+                            if (a && a.href && !dlprotect.test(a.hostname)) {
+                                observer.disconnect();
+                                clearTimeout(timer);
+                                resolve(a.href);
+                            }
+                        };
+                        const observer = new MutationObserver(check);
+                        const timer = setTimeout(() => {
+                            observer.disconnect();
+                            resolve(null);
+                        }, args.timeout);
+                        observer.observe(document.documentElement, { subtree: true, childList: true, attributes: true });
+                        check();
+                    });
+                """, {'timeout': int(remaining * 1000)}, timeout=remaining + 5)
+                break
+            except Exception as e:
+                if attempt:
+                    raise
+                print(f"[DLProtect] Error waiting for download link, retrying: {e}")
+
+        if link and not is_dlprotect_link(link):
+            print(f"[DLProtect] Found download link: {link}")
+            take_screenshot(driver, "09_link_found")
+            return link
 
         print("[DLProtect] Timeout waiting for download link")
         take_screenshot(driver, "09_timeout_no_link")
@@ -347,10 +503,66 @@ def resolve_dlprotect(driver: Driver, url: str):
 
     return None
 
+def resolve_with_browser(url):
+    """Run a Botasaurus resolution while holding the browser lock"""
+    with _BROWSER_LOCK:
+        return resolve_dlprotect(url)
+
+def keep_browser_alive():
+    """Warm up the browser at startup, then run a trivial script on it periodically
+
+    Failures are only logged: a dead browser is not restarted here.
+    """
+    target = WARMUP_URL
+    while True:
+        try:
+            resolve_with_browser(target)
+        except Exception as e:
+            print(f"[DLProtect] Browser keep-alive failed: {e}")
+        target = KEEPALIVE_PING
+        time.sleep(KEEPALIVE_INTERVAL)
+
+def resolve_and_store(url, url_hash):
+    """Resolve a URL with the browser and store the result before releasing the in-flight entry"""
+    resolved_url = None
+    try:
+        resolved_url = resolve_with_browser(url)
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(url_hash, None)
+            push_remote = url_hash in _INFLIGHT_PUSH_REMOTE
+            _INFLIGHT_PUSH_REMOTE.discard(url_hash)
+            if resolved_url and resolved_url != url:
+                # Save to local cache, and to remote cache if any requester allows it
+                _store(url, resolved_url, push_remote=push_remote, url_hash=url_hash)
+    return resolved_url
+
+def resolve_coalesced(url, url_hash=None, push_remote=True):
+    """Resolve a URL, sharing the browser run with identical in-flight requests
+
+    Returns (resolved_url, cached), cached being True when another request stored it meanwhile.
+    """
+    url_hash = url_hash or get_url_hash(url)
+    with _INFLIGHT_LOCK:
+        # A resolution may have completed since this request checked the cache
+        cached_url = _MEM_CACHE.get(url_hash)
+        if cached_url:
+            print(f"[DLProtect] Cache hit: {url_hash}")
+            return cached_url, True
+        future = _INFLIGHT.get(url_hash)
+        if future is None:
+            future = _POOL.submit(resolve_and_store, url, url_hash)
+            _INFLIGHT[url_hash] = future
+        else:
+            print(f"[DLProtect] Joining in-flight resolution: {url_hash}")
+        if push_remote:
+            _INFLIGHT_PUSH_REMOTE.add(url_hash)
+    return future.result(), False
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({
+    return _json({
         'status': 'ok',
         'cache_entries': count_cache_entries()
     })
@@ -360,53 +572,55 @@ def resolve():
     """Resolve a dl-protect link"""
     data = request.get_json()
 
-    if not data or 'url' not in data:
-        return jsonify({'error': 'Missing url parameter'}), 400
+    if not isinstance(data, dict) or not isinstance(data.get('url'), str):
+        return _json({'error': 'Missing url parameter'}), 400
 
     url = data['url']
+    url_hash = get_url_hash(url)
     disable_remote_cache = data.get('disable_remote_cache', False)
 
     if disable_remote_cache:
         print(f"[DLProtect] Remote cache disabled for this request")
 
     # 1. Check local cache first
-    cached_data = load_from_cache(url)
-    if cached_data:
-        return jsonify({
-            'resolved_url': cached_data['resolved_url'],
+    cached_url = load_from_cache(url, url_hash)
+    if cached_url:
+        return _json({
+            'resolved_url': cached_url,
             'cached': True,
             'cache_source': 'local'
         })
 
     # 2. Check remote cache (unless disabled)
     if not disable_remote_cache:
-        remote_result = load_from_remote_cache(url)
+        remote_result = load_from_remote_cache(url, url_hash)
         if remote_result:
-            return jsonify({
+            return _json({
                 'resolved_url': remote_result,
                 'cached': True,
                 'cache_source': 'remote'
             })
 
-    # 3. Resolve with Botasaurus
+    # 3. Resolve with Botasaurus (single browser, one resolution at a time)
     try:
-        resolved_url = resolve_dlprotect(url)
+        # The result is saved to the caches by the resolution itself
+        resolved_url, cached = resolve_coalesced(url, url_hash, push_remote=not disable_remote_cache)
 
-        if resolved_url and resolved_url != url:
-            # 4. Save to local cache
-            save_to_cache(url, resolved_url)
-
-            # 5. Save to remote cache (unless disabled)
-            if not disable_remote_cache:
-                save_to_remote_cache(url, resolved_url)
+        if cached:
+            return _json({
+                'resolved_url': resolved_url,
+                'cached': True,
+                'cache_source': 'local'
+            })
 
-            return jsonify({
+        if resolved_url and resolved_url != url:
+            return _json({
                 'resolved_url': resolved_url,
                 'cached': False
             })
 
         # Resolution failed
-        return jsonify({
+        return _json({
             'resolved_url': url,
             'cached': False,
             'error': 'Could not resolve link'
@@ -414,7 +628,7 @@ def resolve():
 
     except Exception as e:
         print(f"[DLProtect] Error: {e}")
-        return jsonify({
+        return _json({
             'resolved_url': url,
             'cached': False,
             'error': str(e)
@@ -423,22 +637,33 @@ def resolve():
 @app.route('/cache/stats', methods=['GET'])
 def cache_stats():
     """Get cache statistics"""
-    return jsonify({
+    return _json({
         'entries': count_cache_entries(),
-        'directory': CACHE_SUBDIR
+        'directory': CACHE_DIR
     })
 
 @app.route('/cache/clear', methods=['POST'])
 def clear_cache_endpoint():
     """Clear the cache"""
     clear_cache()
-    return jsonify({'status': 'ok', 'message': 'Cache cleared'})
+    return _json({'status': 'ok', 'message': 'Cache cleared'})
 
-if __name__ == '__main__':
-    os.makedirs(CACHE_SUBDIR, exist_ok=True)
+def startup():
+    """Initialize the cache and clean up screenshots (runs once, at import)"""
+    init_cache()
     clear_screenshots()  # Clear screenshots on startup (only in debug mode)
     print(f"[DLProtect] Debug mode: {DEBUG}")
-    print(f"[DLProtect] Cache directory: {CACHE_SUBDIR}")
+    print(f"[DLProtect] Cache database: {CACHE_DB}")
     print(f"[DLProtect] Existing cache entries: {count_cache_entries()}")
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+
+def start_browser_keepalive():
+    """Start the browser warmup / keep-alive thread (Gunicorn post_worker_init or local run)"""
+    threading.Thread(target=keep_browser_alive, daemon=True).start()
+
+# Runs at import so it also applies when served by Gunicorn (see Dockerfile)
+startup()
+
+if __name__ == '__main__':
+    # Local run without Gunicorn
+    start_browser_keepalive()
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))